@@ -16,7 +16,41 @@ def main():
 
     # --- Processing ---
     process_parser = subparsers.add_parser("process", help="Run data processing pipelines")
-    process_parser.add_argument("--type", choices=['clean', 'validate'], default='clean', help="Type of processing")
+    process_parser.add_argument("--type", choices=['clean', 'validate', 'rebuild'], default='clean', help="Type of processing")
+    process_parser.add_argument("--input", type=str, default="data/processed/idx_trading_summary/idx_daily.csv", help="Input CSV for the pipeline")
+    process_parser.add_argument("--output", type=str, help="Output path (validate: violations CSV, rebuild: daily CSV, defaults to --input)")
+    process_parser.add_argument("--archive-dir", type=str, default="data/raw/idx_trading_summary", help="Raw IDX response archive (rebuild)")
+    process_parser.add_argument("--return-threshold", type=float, default=0.35, help="Absolute return flagged as an outlier by validate")
+
+    # --- Screening ---
+    screen_parser = subparsers.add_parser("screen", help="Rank the IDX universe on momentum, volatility, liquidity and foreign flow")
+    screen_parser.add_argument("--data", type=str, default="data/processed/idx_daily_cleaned.csv", help="Cleaned daily CSV")
+    screen_parser.add_argument("--mapping", type=str, default="data/processed/stock_mapping_final.xlsx", help="Sector mapping Excel")
+    screen_parser.add_argument("--as-of", type=str, help="Screening date (YYYY-MM-DD), latest if omitted")
+    screen_parser.add_argument("--sector", type=str, help="Filter by sector name")
+    screen_parser.add_argument("--shariah", action="store_true", help="Shariah compliant stocks only")
+    screen_parser.add_argument("--exclude-flagged", action="store_true", help="Drop suspended, special monitoring and notation stocks (from Remarks)")
+    screen_parser.add_argument("--top", type=int, default=20, help="Number of rows to show")
+
+    # --- Query Service ---
+    serve_parser = subparsers.add_parser("serve", help="Run the local query service with data kept in memory")
+    serve_parser.add_argument("--data-dir", type=str, default="data/processed", help="Directory with the cleaned CSVs")
+    serve_parser.add_argument("--mapping", type=str, default="data/processed/stock_mapping_final.xlsx", help="Sector mapping Excel")
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port")
+    serve_parser.add_argument("--refresh-interval", type=float, default=10.0, help="Seconds between data refresh checks")
+
+    # --- Risk Monitoring ---
+    monitor_parser = subparsers.add_parser("monitor", help="Streaming risk monitor over incremental price updates")
+    monitor_parser.add_argument("--positions", type=str, required=True, help="Holdings as TICKER=SHARES pairs (e.g., BBCA=1000,AADI=500)")
+    monitor_parser.add_argument("--data", type=str, default="data/processed/idx_daily_cleaned.csv", help="Cleaned daily CSV")
+    monitor_parser.add_argument("--since", type=str, help="Warm up on history up to this date, then replay later rows as updates")
+    monitor_parser.add_argument("--simulate", type=int, help="Warm up on all history, then stream this many simulated steps")
+    monitor_parser.add_argument("--confidence", type=float, default=0.95, help="VaR confidence level")
+    monitor_parser.add_argument("--max-return", type=float, help="Alert when a single update moves more than this (log return)")
+    monitor_parser.add_argument("--max-position-var", type=float, help="Alert when position VaR exceeds this fraction of its value")
+    monitor_parser.add_argument("--max-portfolio-var", type=float, help="Alert when portfolio VaR exceeds this amount")
+    monitor_parser.add_argument("--seed", type=int, help="Random seed")
 
     # --- Backtesting ---
     bt_parser = subparsers.add_parser("backtest", help="Run strategy backtests")
@@ -51,7 +85,23 @@ def main():
 
     elif args.command == "process":
         print(f"[Processing] Running {args.type} pipeline...")
-        # TODO: import src.processing.runner and call run(args)
+        from src.processing import runner
+        exit_code = runner.run(args)
+        if exit_code:
+            sys.exit(exit_code)
+
+    elif args.command == "screen":
+        print("[Screen] Ranking IDX universe...")
+        from src.analysis import screening
+        screening.run(args)
+
+    elif args.command == "serve":
+        from src.service import server
+        server.run(args)
+
+    elif args.command == "monitor":
+        from src.risk import streaming
+        streaming.run(args)
 
     elif args.command == "backtest":
         print(f"[Backtest] Initializing strategy: {args.strategy}")
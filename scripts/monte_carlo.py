@@ -3,10 +3,18 @@ import numpy as np
 import matplotlib.pyplot as plt
 import argparse
 import os
+import sys
 
-def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, frequency='daily'):
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.simulation import models
+from src.simulation import cache
+
+def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, frequency='daily', model='gbm', seed=None, use_cache=True):
     """
-    Runs a Monte Carlo simulation for a given stock using Geometric Brownian Motion.
+    Runs a Monte Carlo simulation for a given stock.
+
+    The default model is Geometric Brownian Motion. Fat-tailed and volatility
+    clustering alternatives are available through `model` (see src.simulation.models).
 
     Args:
         data_path (str): Path to the processed CSV file.
@@ -14,8 +22,12 @@ def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, f
         simulations (int): Number of simulation runs.
         time_horizon (int): Number of time steps to simulate (e.g., 252 for 1 year daily).
         frequency (str): Data frequency ('daily', 'weekly', 'monthly').
+        model (str): Simulation model ('gbm', 'student_t', 'bootstrap', 'garch').
+        seed (int): Random seed for reproducible runs.
+        use_cache (bool): Reuse a previous run with identical data, parameters and seed.
+            Only seeded runs are cached, unseeded runs are random by design.
     """
-    print(f"Loading data from {data_path} for {stock_code} ({frequency})...")
+    print(f"Loading data from {data_path} for {stock_code} ({frequency}, {model})...")
     
     try:
         df = pd.read_csv(data_path)
@@ -56,19 +68,43 @@ def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, f
         print(f"  Drift: {drift:.6f}")
 
         # Simulation
-        # Z is random component
-        # Price_t = Price_t-1 * exp(drift + sigma * Z)
-        
-        daily_returns_sim = np.exp(drift + stdev * np.random.normal(0, 1, (time_horizon, simulations)))
-        
-        price_paths = np.zeros_like(daily_returns_sim)
-        price_paths[0] = last_price
-        
-        for t in range(1, time_horizon):
-            price_paths[t] = price_paths[t-1] * daily_returns_sim[t]
-            
-        # Directories
+        # Price_t = Price_t-1 * exp(r_t), with r_t drawn from the chosen model
+        # for all paths at once
         results_dir = os.path.join(os.path.dirname(data_path), '..', '..', 'results')
+        cache_dir = os.path.join(results_dir, 'cache')
+        cache_key = None
+        cached = None
+        if use_cache and seed is not None:
+            cache_key = cache.fingerprint(stock_df, {
+                'stock': stock_code, 'frequency': frequency, 'steps': time_horizon,
+                'sims': simulations, 'model': model, 'seed': seed,
+            })
+            cached = cache.load(cache_key, cache_dir)
+
+        if cached is not None:
+            print(f"  Cache hit ({cache_key[:12]}), skipping simulation.")
+            final_prices = cached['final_prices']
+            plot_paths = cached['plot_paths']
+            model_details = str(cached['model_details'])
+        else:
+            rng = np.random.default_rng(seed)
+            price_paths, params = models.simulate_price_paths(
+                log_returns, last_price, time_horizon, simulations, model=model, rng=rng
+            )
+            model_details = ', '.join(
+                f"{k}={v:.6g}" for k, v in params.items() if np.isscalar(v)
+            )
+            final_prices = price_paths[-1]
+            plot_paths = price_paths[:, :50] # Plot first 50 simulations to avoid clutter
+            if cache_key is not None:
+                cache.store(cache_key, {
+                    'final_prices': final_prices,
+                    'plot_paths': plot_paths,
+                    'model_details': np.array(model_details),
+                }, cache_dir)
+        print(f"  Model: {model} ({model_details})")
+
+        # Directories
         plots_dir = os.path.join(results_dir, 'plots')
         reports_dir = os.path.join(results_dir, 'reports')
         
@@ -78,21 +114,21 @@ def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, f
         # Date string for filename
         from datetime import datetime
         date_str = datetime.now().strftime('%Y-%m-%d')
+        model_suffix = '' if model == 'gbm' else f"_{model}"
 
         # Visualization
         plt.figure(figsize=(10, 6))
-        plt.plot(price_paths[:, :50]) # Plot first 50 simulations to avoid clutter
-        plt.title(f'Monte Carlo Simulation for {stock_code} ({frequency}) - {time_horizon} steps')
+        plt.plot(plot_paths)
+        plt.title(f'Monte Carlo Simulation for {stock_code} ({frequency}, {model}) - {time_horizon} steps')
         plt.xlabel('Time Steps')
         plt.ylabel('Price')
         plt.grid(True)
         
-        output_plot = os.path.join(plots_dir, f"monte_carlo_{stock_code}_{frequency}_{date_str}.png")
+        output_plot = os.path.join(plots_dir, f"monte_carlo_{stock_code}_{frequency}{model_suffix}_{date_str}.png")
         plt.savefig(output_plot)
         print(f"Simulation plot saved to {output_plot}")
         
         # Analysis
-        final_prices = price_paths[-1]
         mean_final_price = np.mean(final_prices)
         VaR_95 = np.percentile(final_prices, 5)
         implied_growth = ((mean_final_price - last_price) / last_price) * 100
@@ -103,20 +139,22 @@ def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, f
         print(f"  Implied Growth: {implied_growth:.2f}%")
         
         # Save Report
-        report_path = os.path.join(reports_dir, f"monte_carlo_{stock_code}_{frequency}_{date_str}.txt")
+        report_path = os.path.join(reports_dir, f"monte_carlo_{stock_code}_{frequency}{model_suffix}_{date_str}.txt")
         with open(report_path, "w") as f:
             f.write(f"Monte Carlo Simulation Report\n")
             f.write(f"=============================\n")
             f.write(f"Date: {date_str}\n")
             f.write(f"Stock: {stock_code}\n")
             f.write(f"Frequency: {frequency}\n")
+            f.write(f"Model: {model}\n")
             f.write(f"Time Horizon: {time_horizon} steps\n")
             f.write(f"Simulations: {simulations}\n\n")
             f.write(f"Statistics:\n")
             f.write(f"  Last Price: {last_price}\n")
             f.write(f"  Mean Log Return: {u:.6f}\n")
             f.write(f"  Volatility (std): {stdev:.6f}\n")
-            f.write(f"  Drift: {drift:.6f}\n\n")
+            f.write(f"  Drift: {drift:.6f}\n")
+            f.write(f"  Model Params: {model_details}\n\n")
             f.write(f"Results:\n")
             f.write(f"  Expected Price: {mean_final_price:.2f}\n")
             f.write(f"  VaR (5%): {VaR_95:.2f}\n")
@@ -126,17 +164,134 @@ def run_monte_carlo(data_path, stock_code, simulations=1000, time_horizon=252, f
     except Exception as e:
         print(f"Error running simulation: {e}")
 
+def run_multi_horizon(data_path, stock_code, horizons, simulations=1000, model='gbm', seed=None, use_cache=True):
+    """
+    Runs one simulation and reports terminal distributions at several horizons.
+
+    Replaces separate daily/weekly/monthly runs for the same ticker: the data is
+    read once, the model is fitted once on daily returns, and all horizons are
+    captured from a single path set.
+
+    Args:
+        data_path (str): Path to the processed daily CSV file.
+        stock_code (str): Ticker symbol of the stock (e.g., 'BBCA').
+        horizons (list): Horizons in daily steps (e.g., [5, 21, 63, 252]).
+        simulations (int): Number of simulation runs.
+        model (str): Simulation model ('gbm', 'student_t', 'bootstrap', 'garch').
+        seed (int): Random seed for reproducible runs.
+        use_cache (bool): Reuse a previous run with identical data, parameters and seed.
+    """
+    horizons = sorted(set(horizons))
+    print(f"Loading data from {data_path} for {stock_code} (horizons {horizons}, {model})...")
+
+    try:
+        df = pd.read_csv(data_path)
+        df['Date'] = pd.to_datetime(df['Date'])
+
+        stock_df = df[df['StockCode'] == stock_code].copy()
+        if stock_df.empty:
+            print(f"Error: Stock {stock_code} not found in dataset.")
+            return
+
+        stock_df = stock_df.sort_values('Date')
+        log_returns = np.log(1 + stock_df['Return'])
+        last_price = stock_df['Close'].iloc[-1]
+
+        results_dir = os.path.join(os.path.dirname(data_path), '..', '..', 'results')
+        cache_dir = os.path.join(results_dir, 'cache')
+        cache_key = None
+        cached = None
+        if use_cache and seed is not None:
+            cache_key = cache.fingerprint(stock_df, {
+                'stock': stock_code, 'frequency': 'daily', 'horizons': horizons,
+                'sims': simulations, 'model': model, 'seed': seed,
+            })
+            cached = cache.load(cache_key, cache_dir)
+
+        if cached is not None:
+            print(f"  Cache hit ({cache_key[:12]}), skipping simulation.")
+            terminal = {h: cached[f'h_{h}'] for h in horizons}
+            model_details = str(cached['model_details'])
+        else:
+            rng = np.random.default_rng(seed)
+            terminal, params = models.simulate_horizons(
+                log_returns, last_price, horizons, simulations, model=model, rng=rng
+            )
+            model_details = ', '.join(
+                f"{k}={v:.6g}" for k, v in params.items() if np.isscalar(v)
+            )
+            if cache_key is not None:
+                arrays = {f'h_{h}': prices for h, prices in terminal.items()}
+                arrays['model_details'] = np.array(model_details)
+                cache.store(cache_key, arrays, cache_dir)
+        print(f"  Last Price: {last_price}")
+        print(f"  Model: {model} ({model_details})")
+
+        rows = []
+        for h in horizons:
+            final_prices = terminal[h]
+            mean_final_price = np.mean(final_prices)
+            rows.append((
+                h, mean_final_price, np.percentile(final_prices, 5),
+                ((mean_final_price - last_price) / last_price) * 100,
+            ))
+
+        header = f"  {'Steps':>6}  {'Expected':>12}  {'VaR (5%)':>12}  {'Growth':>8}"
+        lines = [f"  {h:>6}  {mean:>12.2f}  {var:>12.2f}  {growth:>7.2f}%" for h, mean, var, growth in rows]
+        print(f"Simulation Results ({simulations} runs):")
+        print(header)
+        print("\n".join(lines))
+
+        reports_dir = os.path.join(results_dir, 'reports')
+        os.makedirs(reports_dir, exist_ok=True)
+        from datetime import datetime
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        model_suffix = '' if model == 'gbm' else f"_{model}"
+
+        report_path = os.path.join(reports_dir, f"monte_carlo_{stock_code}_multi{model_suffix}_{date_str}.txt")
+        with open(report_path, "w") as f:
+            f.write(f"Monte Carlo Multi-Horizon Report\n")
+            f.write(f"================================\n")
+            f.write(f"Date: {date_str}\n")
+            f.write(f"Stock: {stock_code}\n")
+            f.write(f"Frequency: daily (weekly = 5 steps, monthly = 21 steps)\n")
+            f.write(f"Model: {model}\n")
+            f.write(f"Horizons: {', '.join(str(h) for h in horizons)} steps\n")
+            f.write(f"Simulations: {simulations}\n\n")
+            f.write(f"Statistics:\n")
+            f.write(f"  Last Price: {last_price}\n")
+            f.write(f"  Model Params: {model_details}\n\n")
+            f.write(f"Results:\n")
+            f.write(header + "\n")
+            f.write("\n".join(lines) + "\n")
+        print(f"Simulation report saved to {report_path}")
+
+    except Exception as e:
+        print(f"Error running simulation: {e}")
+
 def main():
     parser = argparse.ArgumentParser(description="Monte Carlo Simulation for Stock Prices")
     parser.add_argument("--stock", type=str, required=True, help="Stock Ticker (e.g., BBCA)")
     parser.add_argument("--freq", type=str, choices=['daily', 'weekly', 'monthly'], default='daily', help="Data Frequency")
     parser.add_argument("--steps", type=int, default=30, help="Time steps to simulate")
     parser.add_argument("--sims", type=int, default=1000, help="Number of simulations")
+    parser.add_argument("--model", type=str, choices=list(models.MODELS), default='gbm', help="Simulation model")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs (enables the result cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always resimulate, ignoring cached results")
+    parser.add_argument("--horizons", type=str, help="Multi-horizon run on daily data from one path set, e.g. 5,21,63,252 or 1w,1m,3m,12m")
     
     args = parser.parse_args()
     
     base_data_dir = r"c:/Users/ASUS/Desktop/File Cepat/quant_system/data/processed"
     
+    if args.horizons:
+        data_path = os.path.join(base_data_dir, "idx_daily_cleaned.csv")
+        if os.path.exists(data_path):
+            run_multi_horizon(data_path, args.stock, models.parse_horizons(args.horizons), args.sims, args.model, args.seed, not args.no_cache)
+        else:
+            print(f"Error: Data file not found: {data_path}")
+        return
+    
     if args.freq == 'daily':
         data_file = "idx_daily_cleaned.csv"
     elif args.freq == 'weekly':
@@ -147,7 +302,7 @@ def main():
     data_path = os.path.join(base_data_dir, data_file)
     
     if os.path.exists(data_path):
-        run_monte_carlo(data_path, args.stock, args.sims, args.steps, args.freq)
+        run_monte_carlo(data_path, args.stock, args.sims, args.steps, args.freq, args.model, args.seed, not args.no_cache)
     else:
         print(f"Error: Data file not found: {data_path}")
 
@@ -1,8 +1,12 @@
 import pandas as pd
 import os
+import sys
 import argparse
 
-def preprocess_idx_data(input_path, output_path, frequency='daily'):
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.processing import corporate_actions
+
+def preprocess_idx_data(input_path, output_path, frequency='daily', factor_table_path=None):
     """
     Preprocesses IDX trading summary data.
 
@@ -10,6 +14,9 @@ def preprocess_idx_data(input_path, output_path, frequency='daily'):
         input_path (str): Path to the input CSV file.
         output_path (str): Path to save the processed CSV file.
         frequency (str): Frequency of the data ('daily', 'weekly', 'monthly').
+        factor_table_path (str): Corporate action factor table. Daily data updates it
+            incrementally, other frequencies only read it. Returns are computed on the
+            adjusted close when given.
     """
     print(f"Processing {frequency} data from {input_path}...")
     
@@ -22,7 +29,7 @@ def preprocess_idx_data(input_path, output_path, frequency='daily'):
         df = df.dropna(subset=['Date'])
         
         # Ensure numeric columns are actually numeric
-        numeric_cols = ['Close', 'OpenPrice', 'High', 'Low', 'Volume', 'Value', 'Frequency']
+        numeric_cols = ['Close', 'OpenPrice', 'High', 'Low', 'Volume', 'Value', 'Frequency', 'Previous', 'ListedShares']
         for col in numeric_cols:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
@@ -42,8 +49,18 @@ def preprocess_idx_data(input_path, output_path, frequency='daily'):
             print(f"Warning: No valid data found for {frequency} after filtering.")
             return None
 
+        # Adjust for splits / rights issues so they don't show up as fake crashes
+        price_col = 'Close'
+        if factor_table_path:
+            if frequency == 'daily' and 'ListedShares' in df.columns:
+                table = corporate_actions.update_factor_table(df, factor_table_path)
+            else:
+                table = corporate_actions.load_factor_table(factor_table_path)
+            df = corporate_actions.apply_adjustments(df, table)
+            price_col = 'AdjClose'
+
         # Calculate Returns
-        df['Return'] = df.groupby('StockCode')['Close'].pct_change()
+        df['Return'] = df.groupby('StockCode')[price_col].pct_change()
         
         # Drop the first row of each stock (NaN return)
         df = df.dropna(subset=['Return'])
@@ -76,7 +93,7 @@ def generate_monthly_from_daily(daily_output_path, monthly_output_path):
         
         def resample_stock(group):
             # Resample to month end
-            monthly_group = group.set_index('Date').resample('ME').agg({
+            agg_rules = {
                 'Close': 'last',
                 'High': 'max',
                 'Low': 'min',
@@ -84,7 +101,10 @@ def generate_monthly_from_daily(daily_output_path, monthly_output_path):
                 'Volume': 'sum',
                 'Value': 'sum',
                 'Frequency': 'sum'
-            })
+            }
+            if 'AdjClose' in group.columns:
+                agg_rules['AdjClose'] = 'last'
+            monthly_group = group.set_index('Date').resample('ME').agg(agg_rules)
             return monthly_group
 
         monthly_df = df.groupby('StockCode', group_keys=True).apply(resample_stock).reset_index()
@@ -98,8 +118,9 @@ def generate_monthly_from_daily(daily_output_path, monthly_output_path):
         # Handle zero Close (just in case)
         monthly_df = monthly_df[monthly_df['Close'] > 0]
 
-        # Calculate Monthly Returns
-        monthly_df['Return'] = monthly_df.groupby('StockCode')['Close'].pct_change()
+        # Calculate Monthly Returns (on the adjusted close when daily data was adjusted)
+        price_col = 'AdjClose' if 'AdjClose' in monthly_df.columns else 'Close'
+        monthly_df['Return'] = monthly_df.groupby('StockCode')[price_col].pct_change()
         monthly_df = monthly_df.dropna(subset=['Return'])
 
         print(f"Saving generated monthly data to {monthly_output_path}...")
@@ -120,16 +141,17 @@ def main():
     daily_output = os.path.join(base_data_dir, "idx_daily_cleaned.csv")
     weekly_output = os.path.join(base_data_dir, "idx_weekly_cleaned.csv")
     monthly_output = os.path.join(base_data_dir, "idx_monthly_cleaned.csv")
+    factor_table = os.path.join(base_data_dir, "corporate_action_factors.csv")
     
-    # 1. Process Daily
+    # 1. Process Daily (also updates the corporate action factor table)
     if os.path.exists(daily_input):
-        preprocess_idx_data(daily_input, daily_output, "daily")
+        preprocess_idx_data(daily_input, daily_output, "daily", factor_table)
     else:
         print("Error: Daily input file not found.")
 
     # 2. Process Weekly
     if os.path.exists(weekly_input):
-        preprocess_idx_data(weekly_input, weekly_output, "weekly")
+        preprocess_idx_data(weekly_input, weekly_output, "weekly", factor_table)
     else:
         print("Error: Weekly input file not found.")
 
@@ -0,0 +1,192 @@
+import os
+import pandas as pd
+import numpy as np
+
+from src.processing import remarks
+
+# Factor definitions: name -> (column it is computed from, higher_is_better)
+FACTORS = {
+    'momentum': ('Close', True),
+    'volatility': ('Return', False),
+    'liquidity_value': ('Value', True),
+    'liquidity_frequency': ('Frequency', True),
+    'foreign_flow': ('NetForeign', True),
+}
+
+DEFAULT_WINDOWS = {
+    'momentum': 63,
+    'volatility': 21,
+    'liquidity_value': 21,
+    'liquidity_frequency': 21,
+    'foreign_flow': 21,
+}
+
+# Cache of computed factor panels keyed by (name, window, as-of date of the data).
+_factor_cache = {}
+
+
+def build_panel(df, column):
+    """
+    Pivots the long IDX table into a wide Date x StockCode panel for one column.
+    """
+    return df.pivot_table(index='Date', columns='StockCode', values=column, aggfunc='last').sort_index()
+
+
+def prepare_data(df):
+    """
+    Normalizes the cleaned IDX table for screening (dates, numerics, net foreign flow).
+    """
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    for col in ['Close', 'Return', 'Value', 'Frequency', 'ForeignBuy', 'ForeignSell']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if 'ForeignBuy' in df.columns and 'ForeignSell' in df.columns:
+        df['NetForeign'] = df['ForeignBuy'] - df['ForeignSell']
+    return df
+
+
+def build_panels(df, factors=None):
+    """
+    Builds every wide panel the requested factors need, from prepared data.
+    """
+    factors = factors or DEFAULT_WINDOWS
+    columns = {FACTORS[name][0] for name in factors}
+    if 'foreign_flow' in factors:
+        columns.add('Value')
+    return {col: build_panel(df, col) for col in columns if col in df.columns}
+
+
+def compute_factor(panels, name, window):
+    """
+    Computes one rolling factor over the full Date x StockCode panel.
+
+    Args:
+        panels (dict): column name -> wide panel (see build_panel).
+        name (str): Factor name from FACTORS.
+        window (int): Rolling window in rows (trading sessions).
+
+    Returns:
+        pd.DataFrame: Date x StockCode factor values.
+    """
+    if name == 'momentum':
+        return panels['Close'] / panels['Close'].shift(window) - 1
+    if name == 'volatility':
+        return panels['Return'].rolling(window, min_periods=window // 2).std()
+    if name in ('liquidity_value', 'liquidity_frequency'):
+        column = FACTORS[name][0]
+        return panels[column].rolling(window, min_periods=window // 2).mean()
+    if name == 'foreign_flow':
+        # Net foreign buying relative to traded value over the window
+        net = panels['NetForeign'].rolling(window, min_periods=window // 2).sum()
+        value = panels['Value'].rolling(window, min_periods=window // 2).sum()
+        return net / value.replace(0, np.nan)
+    raise ValueError(f"Unknown factor '{name}'. Available: {', '.join(FACTORS)}")
+
+
+def get_factor(panels, name, window):
+    """
+    Returns the full factor panel, computing it once per (name, window, as-of date).
+
+    The as-of date is the last date of the panels, so a refreshed dataset gets new
+    cache entries while screens on the same data reuse the computed panel.
+    """
+    as_of = next(iter(panels.values())).index[-1]
+    key = (name, window, as_of)
+    if key not in _factor_cache:
+        _factor_cache[key] = compute_factor(panels, name, window)
+    return _factor_cache[key]
+
+
+def clear_cache():
+    _factor_cache.clear()
+
+
+def load_sector_mapping(mapping_path):
+    """
+    Loads stock_mapping_final.xlsx into StockCode, Sector, Board, Shariah columns.
+    """
+    mapping = pd.read_excel(mapping_path)
+    mapping = mapping.rename(columns={'Kode Saham': 'StockCode'})
+    return mapping[['StockCode', 'Board', 'Sector', 'Shariah']]
+
+
+def screen(df, factors=None, as_of=None, mapping=None, sector=None, shariah_only=False, panels=None,
+           flags=None, exclude=()):
+    """
+    Ranks the whole IDX universe on the requested factors at one date.
+
+    Each factor is turned into a percentile rank (1.0 = best) and the composite
+    score is the mean of the ranks.
+
+    Args:
+        df (pd.DataFrame): Cleaned IDX daily data (already passed through prepare_data
+            when `panels` is given).
+        factors (dict): factor name -> window. Defaults to DEFAULT_WINDOWS.
+        as_of (str or Timestamp): Screening date, the latest date if None.
+        mapping (pd.DataFrame): Output of load_sector_mapping, enables sector/shariah slicing.
+        sector (str): Keep only tickers whose Sector contains this text.
+        shariah_only (bool): Keep only Shariah compliant tickers.
+        panels (dict): Prebuilt wide panels, reused across screens when given.
+        flags (pd.DataFrame): Decoded Remarks flags per StockCode (remarks.latest_flags).
+            Built from `df` when `exclude` is set and no flags are given.
+        exclude (iterable): Boolean flag columns that drop a ticker when set,
+            e.g. ('Suspended', 'SpecialMonitoring', 'HasNotation').
+
+    Returns:
+        pd.DataFrame: One row per ticker with raw factors, ranks and Score, best first.
+    """
+    factors = factors or DEFAULT_WINDOWS
+    if panels is None:
+        panels = build_panels(prepare_data(df), factors)
+
+    dates = next(iter(panels.values())).index
+    as_of = dates[-1] if as_of is None else pd.Timestamp(as_of)
+
+    result = pd.DataFrame(index=next(iter(panels.values())).columns)
+    rank_cols = []
+    for name, window in factors.items():
+        values = get_factor(panels, name, window).loc[:as_of].iloc[-1]
+        result[name] = values
+        ascending = FACTORS[name][1]
+        result[f'{name}_rank'] = values.rank(pct=True, ascending=ascending)
+        rank_cols.append(f'{name}_rank')
+
+    result['Score'] = result[rank_cols].mean(axis=1)
+    result = result.dropna(subset=['Score'])
+    result.index.name = 'StockCode'
+    result = result.reset_index()
+
+    if mapping is not None:
+        result = result.merge(mapping, on='StockCode', how='left')
+        if sector:
+            result = result[result['Sector'].fillna('').str.contains(sector, case=False, regex=False)]
+        if shariah_only:
+            result = result[result['Shariah'] == 'Yes']
+
+    if exclude:
+        if flags is None:
+            flags = remarks.latest_flags(df, as_of)
+        flagged = flags[list(exclude)].any(axis=1)
+        result = result[~result['StockCode'].isin(flagged.index[flagged])]
+
+    return result.sort_values('Score', ascending=False).reset_index(drop=True)
+
+
+def run(args):
+    """
+    Entry point for `main.py screen`.
+    """
+    if not os.path.exists(args.data):
+        print(f"[Screen] Error: Data file not found: {args.data}")
+        return
+
+    df = pd.read_csv(args.data)
+    mapping = load_sector_mapping(args.mapping) if os.path.exists(args.mapping) else None
+    if mapping is None and (args.sector or args.shariah):
+        print(f"[Screen] Mapping not found: {args.mapping}. Sector/Shariah filters ignored.")
+
+    exclude = remarks.FLAG_COLUMNS if args.exclude_flagged else ()
+    result = screen(df, as_of=args.as_of, mapping=mapping, sector=args.sector, shariah_only=args.shariah,
+                    exclude=exclude)
+    print(result.head(args.top).to_string(index=False))
@@ -0,0 +1,161 @@
+import os
+import csv
+import gzip
+import json
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:  # Optional, gzip is used when zstandard is not installed
+    zstandard = None
+
+INDEX_FILE = "index.csv"
+INDEX_COLUMNS = ['Date', 'File', 'Records', 'RawBytes', 'StoredBytes', 'Codec', 'ArchivedAt']
+
+
+def _codec():
+    return 'zst' if zstandard is not None else 'gz'
+
+
+def _compress(raw, codec):
+    if codec == 'zst':
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=9)
+
+
+def _decompress(data, codec):
+    if codec == 'zst':
+        if zstandard is None:
+            raise ImportError("zstandard is required to read .zst archive entries")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def load_index(archive_dir):
+    """
+    Returns the archive index as a DataFrame (empty if nothing is archived yet).
+    """
+    index_path = os.path.join(archive_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    return pd.read_csv(index_path)
+
+
+def archived_dates(archive_dir):
+    """
+    Set of dates (YYYY-MM-DD) already present in the archive.
+    """
+    return set(load_index(archive_dir)['Date'].astype(str))
+
+
+def archive_response(archive_dir, display_date, raw, records=None):
+    """
+    Stores one raw IDX API response, compressed, under its trading date.
+
+    The archive is append-only: an existing date is never overwritten, and each new
+    entry is appended to index.csv.
+
+    Args:
+        archive_dir (str): Root directory of the archive.
+        display_date (str): Trading date (YYYY-MM-DD).
+        raw (bytes): Raw response body exactly as returned by the API.
+        records (int): Number of records in the response, for the index.
+
+    Returns:
+        bool: True if the entry was written, False if the date was already archived.
+    """
+    codec = _codec()
+    rel_path = os.path.join(display_date[:4], f"{display_date}.json.{codec}")
+    path = os.path.join(archive_dir, rel_path)
+    existing = [p for p in (path[:-len(codec)] + c for c in ('gz', 'zst')) if os.path.exists(p)]
+    if existing:
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stored = _compress(raw, codec)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(stored)
+    os.replace(tmp_path, path)
+
+    index_path = os.path.join(archive_dir, INDEX_FILE)
+    write_header = not os.path.exists(index_path)
+    with open(index_path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(INDEX_COLUMNS)
+        writer.writerow([
+            display_date, rel_path.replace(os.sep, '/'), records if records is not None else '',
+            len(raw), len(stored), codec, datetime.datetime.now().isoformat(timespec='seconds'),
+        ])
+    return True
+
+
+def read_entry(archive_dir, rel_path):
+    """
+    Decompresses one archived response and returns its records with a Date column.
+    """
+    path = os.path.join(archive_dir, rel_path)
+    codec = rel_path.rsplit('.', 1)[-1]
+    with open(path, 'rb') as f:
+        payload = json.loads(_decompress(f.read(), codec))
+    display_date = os.path.basename(rel_path).split('.', 1)[0]
+    df = pd.DataFrame(payload.get('data') or [])
+    df['Date'] = display_date
+    return df
+
+
+def _read_entry_args(args):
+    return read_entry(*args)
+
+
+def rebuild_daily(archive_dir, output_path, workers=None, start=None, end=None):
+    """
+    Regenerates the daily table from the archive, decoding entries in parallel.
+
+    Columns are the union of all archived schemas in first-seen order, so fields
+    that appear or disappear over time end up aligned instead of shifted.
+
+    Args:
+        archive_dir (str): Root directory of the archive.
+        output_path (str): Where to write the rebuilt CSV.
+        workers (int): Worker processes, defaults to the CPU count.
+        start (str): Optional first date (YYYY-MM-DD) to include.
+        end (str): Optional last date (YYYY-MM-DD) to include.
+
+    Returns:
+        pd.DataFrame: The rebuilt daily table.
+    """
+    index = load_index(archive_dir).drop_duplicates(subset=['Date'], keep='first')
+    if start:
+        index = index[index['Date'] >= start]
+    if end:
+        index = index[index['Date'] <= end]
+    index = index.sort_values('Date')
+
+    if index.empty:
+        print(f"[Archive] No archived dates to rebuild in {archive_dir}.")
+        return None
+
+    print(f"[Archive] Rebuilding {len(index)} day(s) from {archive_dir}...")
+    tasks = [(archive_dir, rel_path) for rel_path in index['File']]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(_read_entry_args, tasks, chunksize=16))
+
+    columns = []
+    for frame in frames:
+        columns.extend(c for c in frame.columns if c not in columns)
+    df = pd.concat([f.reindex(columns=columns) for f in frames if not f.empty], ignore_index=True)
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    df.to_csv(output_path, index=False)
+
+    raw_bytes = index['RawBytes'].sum()
+    stored_bytes = index['StoredBytes'].sum()
+    print(f"[Archive] Rebuilt {len(df)} rows -> {output_path}")
+    print(f"[Archive] Archive size: {stored_bytes / 1e6:.1f} MB stored vs {raw_bytes / 1e6:.1f} MB raw "
+          f"({stored_bytes / max(raw_bytes, 1):.1%}).")
+    return df
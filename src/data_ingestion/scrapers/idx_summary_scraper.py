@@ -8,13 +8,23 @@ import os
 import random
 import csv
 
-def run_scraper(start_date="2022-03-01", output_dir="data/processed/idx_trading_summary"):
+from src.data_ingestion import archive
+
+def run_scraper(start_date="2022-03-01", output_dir="data/processed/idx_trading_summary", archive_dir="data/raw/idx_trading_summary"):
     scraper = cloudscraper.create_scraper()
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     daily_file = os.path.join(output_dir, "idx_daily.csv")
     
+    # Raw responses are archived before parsing, so the daily table can always be
+    # rebuilt (archive.rebuild_daily) without re-scraping
+    os.makedirs(archive_dir, exist_ok=True)
+    daily_columns = None
+    if os.path.exists(daily_file):
+        with open(daily_file, newline='') as f:
+            daily_columns = next(csv.reader(f), None)
+    
     # Check for existing data to resume
     existing_dates = set()
     if os.path.exists(daily_file):
@@ -65,6 +75,7 @@ def run_scraper(start_date="2022-03-01", output_dir="data/processed/idx_trading_
                     data = response.json()
                     if 'data' in data and data['data']:
                         daily_records = data['data']
+                        archive.archive_response(archive_dir, display_date, response.content, len(daily_records))
                         # Add Date column
                         for record in daily_records:
                             record['Date'] = display_date
@@ -75,9 +86,15 @@ def run_scraper(start_date="2022-03-01", output_dir="data/processed/idx_trading_
                         
                         # Use pandas to append easily
                         df_temp = pd.DataFrame(daily_records)
-                        # Ensure columns are consistent? 
-                        # We trust the API returns consistent schema usually, but to be safe we might align cols if needed
-                        # For now, just append
+                        # Align to the existing header so schema drift can't shift columns.
+                        # Fields the header doesn't know are still kept in the raw archive.
+                        if daily_columns is None:
+                            daily_columns = df_temp.columns.tolist()
+                        else:
+                            dropped = [c for c in df_temp.columns if c not in daily_columns]
+                            if dropped:
+                                print(f" [Schema] New fields archived only: {', '.join(dropped)}.", end="")
+                            df_temp = df_temp.reindex(columns=daily_columns)
                         
                         df_temp.to_csv(daily_file, mode=mode, header=write_header, index=False)
                         
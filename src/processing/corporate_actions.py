@@ -0,0 +1,200 @@
+import os
+import json
+import pandas as pd
+import numpy as np
+
+FACTOR_COLUMNS = ['StockCode', 'ExDate', 'Factor', 'CumFactor', 'Source']
+
+# Minimum relative jump in ListedShares that counts as a corporate action.
+DEFAULT_SHARES_JUMP = 0.05
+
+# Factors this close to 1 are noise (e.g. tick rounding of the reference price).
+MIN_FACTOR_DEVIATION = 0.01
+
+
+def detect_corporate_actions(df, shares_jump=DEFAULT_SHARES_JUMP):
+    """
+    Detects splits, bonus shares and rights issues from ListedShares jumps.
+
+    On the ex-date IDX publishes an adjusted reference price in `Previous`, so the
+    price adjustment factor is Previous / prior Close. When `Previous` is missing
+    the factor falls back to the inverse of the share count ratio (pure split).
+
+    Args:
+        df (pd.DataFrame): Daily IDX panel with StockCode, Date, Close, ListedShares.
+        shares_jump (float): Minimum relative ListedShares change to flag an event.
+
+    Returns:
+        pd.DataFrame: Events with StockCode, ExDate, Factor, Source.
+    """
+    cols = ['StockCode', 'Date', 'Close', 'ListedShares'] + (['Previous'] if 'Previous' in df.columns else [])
+    panel = df[cols].copy()
+    panel['Date'] = pd.to_datetime(panel['Date'])
+    for col in cols[2:]:
+        panel[col] = pd.to_numeric(panel[col], errors='coerce')
+    panel = panel.sort_values(['StockCode', 'Date'], kind='mergesort')
+
+    codes = panel['StockCode'].to_numpy()
+    same_stock = np.zeros(len(panel), dtype=bool)
+    same_stock[1:] = codes[1:] == codes[:-1]
+
+    shares = panel['ListedShares'].to_numpy(dtype=float)
+    close = panel['Close'].to_numpy(dtype=float)
+    prev_shares = np.concatenate([[np.nan], shares[:-1]])
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share_ratio = shares / prev_shares
+        factor = 1.0 / share_ratio
+        if 'Previous' in panel.columns:
+            reference = panel['Previous'].to_numpy(dtype=float)
+            ref_factor = reference / prev_close
+            usable = np.isfinite(ref_factor) & (ref_factor > 0)
+            factor = np.where(usable, ref_factor, factor)
+
+        is_event = (
+            same_stock
+            & (np.abs(share_ratio - 1) > shares_jump)
+            & np.isfinite(factor) & (factor > 0)
+            & (np.abs(factor - 1) > MIN_FACTOR_DEVIATION)
+        )
+
+    events = pd.DataFrame({
+        'StockCode': codes[is_event],
+        'ExDate': panel['Date'].to_numpy()[is_event],
+        'Factor': factor[is_event],
+        'Source': 'listed_shares',
+    })
+    return events
+
+
+def build_factor_table(events):
+    """
+    Computes the cumulative adjustment factor per event.
+
+    CumFactor of an event is the product of its own factor and all later factors of
+    the same ticker, i.e. the multiplier for prices traded before its ex-date.
+    """
+    if events.empty:
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+    table = events.copy()
+    table['ExDate'] = pd.to_datetime(table['ExDate'])
+    # Manual entries win over detected ones on the same ex-date
+    table['_priority'] = (table['Source'] != 'manual').astype(int)
+    table = table.sort_values(['StockCode', 'ExDate', '_priority'])
+    table = table.drop_duplicates(subset=['StockCode', 'ExDate'], keep='first')
+
+    # Reverse cumulative product per ticker in one vectorized pass
+    table = table.iloc[::-1]
+    table['CumFactor'] = table.groupby('StockCode')['Factor'].cumprod()
+    table = table.iloc[::-1].reset_index(drop=True)
+    return table[FACTOR_COLUMNS]
+
+
+def load_corporate_actions(path):
+    """
+    Loads manually maintained corporate actions (StockCode, ExDate, Factor).
+    """
+    actions = pd.read_csv(path)
+    actions['ExDate'] = pd.to_datetime(actions['ExDate'])
+    actions['Source'] = 'manual'
+    return actions[['StockCode', 'ExDate', 'Factor', 'Source']]
+
+
+def _state_path(table_path):
+    return os.path.splitext(table_path)[0] + '_state.json'
+
+
+def load_factor_table(table_path):
+    """
+    Reads the factor table from disk, or an empty one if it does not exist yet.
+    """
+    if not os.path.exists(table_path):
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+    table = pd.read_csv(table_path)
+    table['ExDate'] = pd.to_datetime(table['ExDate'])
+    return table
+
+
+def update_factor_table(df, table_path, actions_path=None, shares_jump=DEFAULT_SHARES_JUMP):
+    """
+    Incrementally extends the on-disk factor table with events from new rows only.
+
+    The last scanned date is kept in a small state file next to the table. Only
+    rows after it (plus the previous row of each ticker, needed for the jump
+    comparison) are scanned, so nightly loads never rescan the full history.
+
+    Args:
+        df (pd.DataFrame): Daily IDX panel with StockCode, Date, Close, ListedShares.
+        table_path (str): CSV path of the factor table.
+        actions_path (str): Optional CSV of manual corporate actions to merge in.
+        shares_jump (float): Minimum relative ListedShares change to flag an event.
+
+    Returns:
+        pd.DataFrame: The updated factor table.
+    """
+    table = load_factor_table(table_path)
+    state_path = _state_path(table_path)
+    last_scanned = None
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            last_scanned = pd.Timestamp(json.load(f)['last_scanned'])
+
+    dates = pd.to_datetime(df['Date'])
+    if last_scanned is not None:
+        # Keep the last already-scanned row of each ticker as the comparison anchor
+        is_new = dates > last_scanned
+        anchors = df[~is_new].assign(_Date=dates[~is_new]).sort_values('_Date')
+        anchors = anchors.groupby('StockCode').tail(1).drop(columns='_Date')
+        scan = pd.concat([anchors, df[is_new]])
+    else:
+        scan = df
+
+    new_events = detect_corporate_actions(scan, shares_jump=shares_jump) if len(scan) else None
+    frames = [table[['StockCode', 'ExDate', 'Factor', 'Source']]]
+    if new_events is not None and not new_events.empty:
+        frames.append(new_events)
+        print(f"[Adjust] Detected {len(new_events)} new corporate action(s).")
+    if actions_path and os.path.exists(actions_path):
+        frames.append(load_corporate_actions(actions_path))
+
+    frames = [f for f in frames if not f.empty]
+    table = build_factor_table(pd.concat(frames, ignore_index=True)) if frames else build_factor_table(table)
+
+    os.makedirs(os.path.dirname(table_path) or '.', exist_ok=True)
+    table.to_csv(table_path, index=False)
+    if len(dates):
+        with open(state_path, 'w') as f:
+            json.dump({'last_scanned': dates.max().strftime('%Y-%m-%d')}, f)
+    return table
+
+
+def apply_adjustments(df, table, price_cols=('Close',)):
+    """
+    Adds Adj* price columns using the factor table, without touching raw prices.
+
+    Each row picks the CumFactor of the first event strictly after its date
+    (merge_asof forward), so any frequency (daily, weekly, monthly) can be adjusted
+    from the same daily factor table.
+    """
+    out = df.copy()
+    out['Date'] = pd.to_datetime(out['Date'])
+    out['_row'] = np.arange(len(out))
+
+    if table.empty:
+        multiplier = np.ones(len(out))
+    else:
+        left = out[['StockCode', 'Date', '_row']].sort_values('Date')
+        right = table[['StockCode', 'ExDate', 'CumFactor']].sort_values('ExDate')
+        right['ExDate'] = pd.to_datetime(right['ExDate'])
+        merged = pd.merge_asof(
+            left, right, left_on='Date', right_on='ExDate', by='StockCode',
+            direction='forward', allow_exact_matches=False,
+        )
+        multiplier = np.ones(len(out))
+        multiplier[merged['_row'].to_numpy()] = merged['CumFactor'].fillna(1.0).to_numpy(dtype=float)
+
+    for col in price_cols:
+        if col in out.columns:
+            out[f'Adj{col}'] = pd.to_numeric(out[col], errors='coerce') * multiplier
+    return out.drop(columns='_row')
@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+
+# Positional layout of the 30-char IDX Remarks code, e.g. '--U-4100000000E614-E---------X'.
+# '-' means the position is not set.
+REMARKS_LENGTH = 30
+SUSPENSION_POS = 1
+BOARD_POS = 2
+NOTATION_SLICE = slice(18, 29)
+SPECIAL_MONITORING_POS = 29
+
+BOARD_NAMES = {
+    'U': 'Utama',
+    'P': 'Pengembangan',
+    'A': 'Akselerasi',
+    'E': 'Ekonomi Baru',
+    'W': 'Pemantauan Khusus',
+}
+
+# IDX special notation letters (notasi khusus)
+NOTATION_LETTERS = {
+    'B': 'bankruptcy petition',
+    'M': 'debt restructuring (PKPU)',
+    'E': 'negative equity',
+    'A': 'adverse audit opinion',
+    'D': 'disclaimer audit opinion',
+    'L': 'late financial report',
+    'S': 'no revenue reported',
+    'C': 'lawsuit against the company',
+    'Q': 'restricted activity',
+    'Y': 'no public expose',
+    'F': 'fine from OJK',
+    'G': 'going concern',
+    'V': 'adverse going concern',
+    'N': 'non-voting shares',
+    'I': 'interim report not audited',
+}
+
+FLAG_COLUMNS = ['Suspended', 'SpecialMonitoring', 'HasNotation']
+
+
+def decode_code(code):
+    """
+    Decodes a single Remarks code into a dict of typed fields.
+    """
+    code = code if isinstance(code, str) else ''
+    code = code.ljust(REMARKS_LENGTH, '-')
+    board = code[BOARD_POS]
+    notations = ''.join(c for c in code[NOTATION_SLICE] if c in NOTATION_LETTERS)
+
+    decoded = {
+        'Suspended': code[SUSPENSION_POS] == 'S',
+        'Board': BOARD_NAMES.get(board, board if board != '-' else None),
+        'SpecialMonitoring': code[SPECIAL_MONITORING_POS] == 'X',
+        'Notations': notations,
+        'HasNotation': bool(notations),
+    }
+    for letter in NOTATION_LETTERS:
+        decoded[f'Notation_{letter}'] = letter in notations
+    return decoded
+
+
+def decode_remarks(remarks):
+    """
+    Decodes a Remarks column into flag columns aligned with its index.
+
+    The column is converted to a categorical, its categories (598 codes in the
+    IDX history versus millions of rows) are decoded once, and the result is
+    broadcast back to rows with an integer take on the category codes.
+
+    Args:
+        remarks (pd.Series): Raw Remarks codes.
+
+    Returns:
+        pd.DataFrame: One row per input row with Suspended, Board, SpecialMonitoring,
+            Notations, HasNotation and one Notation_<letter> column per notation.
+    """
+    categorical = remarks.astype('category')
+    categories = categorical.cat.categories.astype(str)
+    lookup = pd.DataFrame(
+        [decode_code(code) for code in categories] + [decode_code(None)],
+    )
+    # Missing codes are -1, which picks the trailing "not set" row
+    positions = categorical.cat.codes.to_numpy()
+    positions = np.where(positions < 0, len(categories), positions)
+
+    decoded = lookup.take(positions)
+    decoded.index = remarks.index
+    decoded['Board'] = decoded['Board'].astype('category')
+    decoded['Notations'] = decoded['Notations'].astype('category')
+    return decoded
+
+
+def latest_flags(df, as_of=None):
+    """
+    Decoded Remarks flags of each ticker's most recent row (up to `as_of`), indexed by StockCode.
+    """
+    latest = df[['StockCode', 'Date', 'Remarks']].copy()
+    latest['Date'] = pd.to_datetime(latest['Date'])
+    if as_of is not None:
+        latest = latest[latest['Date'] <= pd.Timestamp(as_of)]
+    latest = latest.sort_values('Date').groupby('StockCode').tail(1)
+    flags = decode_remarks(latest['Remarks'])
+    flags.index = latest['StockCode'].to_numpy()
+    flags.index.name = 'StockCode'
+    return flags
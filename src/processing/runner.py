@@ -0,0 +1,33 @@
+import os
+from datetime import datetime
+
+from src.processing import validation
+from src.data_ingestion import archive
+
+
+def run(args):
+    """
+    Entry point for `main.py process`. Returns a process exit code.
+    """
+    if args.type == 'validate':
+        output_path = args.output
+        if output_path is None:
+            reports_dir = os.path.join('results', 'validation')
+            os.makedirs(reports_dir, exist_ok=True)
+            date_str = datetime.now().strftime('%Y-%m-%d')
+            output_path = os.path.join(reports_dir, f"violations_{date_str}.csv")
+
+        if not os.path.exists(args.input):
+            print(f"[Processing] Error: Input file not found: {args.input}")
+            return 1
+
+        passed = validation.run_validation(args.input, output_path, args.return_threshold)
+        return 0 if passed else 1
+
+    if args.type == 'rebuild':
+        output_path = args.output or args.input
+        df = archive.rebuild_daily(args.archive_dir, output_path)
+        return 0 if df is not None else 1
+
+    print(f"[Processing] Pipeline '{args.type}' not yet implemented.")
+    return 0
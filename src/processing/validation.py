@@ -0,0 +1,170 @@
+import pandas as pd
+import numpy as np
+
+from src.processing import remarks
+
+# Severity per rule. 'error' rows fail the nightly gate, 'warning' rows are reported only.
+RULE_SEVERITY = {
+    'missing_close': 'error',
+    'non_positive_price': 'error',
+    'ohlc_inconsistent': 'error',
+    'duplicate_row': 'error',
+    'return_outlier': 'warning',
+    'suspended': 'warning',
+    'trading_gap': 'warning',
+}
+
+VIOLATION_COLUMNS = ['Rule', 'Severity', 'StockCode', 'Date', 'Value']
+
+PRICE_COLS = ['OpenPrice', 'High', 'Low', 'Close']
+
+# IDX auto-rejection tops out at 35% per session, anything beyond that is suspicious.
+DEFAULT_RETURN_THRESHOLD = 0.35
+
+
+def _violations(rule, mask, codes, dates, values):
+    """
+    Builds the violation rows for one rule from a boolean mask over the panel.
+    """
+    idx = np.flatnonzero(mask)
+    return pd.DataFrame({
+        'Rule': rule,
+        'Severity': RULE_SEVERITY[rule],
+        'StockCode': codes[idx],
+        'Date': dates[idx],
+        'Value': values[idx],
+    })
+
+
+def validate_panel(df, return_threshold=DEFAULT_RETURN_THRESHOLD):
+    """
+    Runs all data quality rules column-wise over the full IDX panel.
+
+    Every rule is evaluated as a vectorized mask over the whole dataset after a
+    single (StockCode, Date) sort, so there is no per-ticker Python loop.
+
+    Args:
+        df (pd.DataFrame): Raw or cleaned IDX trading summary (one row per StockCode/Date).
+        return_threshold (float): Absolute simple return above which a row is an outlier.
+
+    Returns:
+        pd.DataFrame: Violations table with columns Rule, Severity, StockCode, Date, Value.
+    """
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    for col in PRICE_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    df = df.sort_values(['StockCode', 'Date'], kind='mergesort').reset_index(drop=True)
+
+    codes = df['StockCode'].to_numpy()
+    dates = df['Date'].to_numpy()
+    close = df['Close'].to_numpy(dtype=float)
+    frames = []
+
+    # Duplicate (StockCode, Date) rows, e.g. from a scraper append that ran twice
+    dup_mask = df.duplicated(subset=['StockCode', 'Date'], keep='first').to_numpy()
+    frames.append(_violations('duplicate_row', dup_mask, codes, dates, close))
+
+    # Missing and non-positive prices
+    frames.append(_violations('missing_close', np.isnan(close), codes, dates, close))
+    present = [c for c in PRICE_COLS if c in df.columns]
+    prices = df[present].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore'):
+        non_positive = (prices <= 0).any(axis=1)
+    frames.append(_violations('non_positive_price', non_positive, codes, dates, close))
+
+    # OHLC consistency: Low <= Open, Close <= High. Rows with no trade report 0 for
+    # Open/High/Low, those are already covered by non_positive_price.
+    if all(c in df.columns for c in PRICE_COLS):
+        open_ = df['OpenPrice'].to_numpy(dtype=float)
+        high = df['High'].to_numpy(dtype=float)
+        low = df['Low'].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            bad_ohlc = (
+                (high < np.fmax(open_, close))
+                | (low > np.fmin(open_, close))
+                | (low > high)
+            ) & ~non_positive
+        frames.append(_violations('ohlc_inconsistent', bad_ohlc, codes, dates, close))
+
+    # Return outliers, computed against the previous row of the same ticker
+    same_stock = np.zeros(len(df), dtype=bool)
+    same_stock[1:] = codes[1:] == codes[:-1]
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(same_stock & ~dup_mask, close / prev_close - 1, np.nan)
+        outliers = np.abs(returns) > return_threshold
+    frames.append(_violations('return_outlier', outliers, codes, dates, returns))
+
+    # Suspensions flagged in the Remarks code
+    if 'Remarks' in df.columns:
+        suspended = remarks.decode_remarks(df['Remarks'])['Suspended'].to_numpy()
+        frames.append(_violations('suspended', suspended, codes, dates, close))
+
+    # Trading gaps: sessions on the market calendar missing between two rows of a ticker
+    calendar = np.unique(dates[~np.isnat(dates)])
+    session = np.searchsorted(calendar, dates)
+    gap = np.zeros(len(df), dtype=np.int64)
+    gap[1:] = session[1:] - session[:-1] - 1
+    gap_mask = same_stock & ~dup_mask & (gap > 0) & ~np.isnat(dates)
+    frames.append(_violations('trading_gap', gap_mask, codes, dates, gap.astype(float)))
+
+    violations = pd.concat([f for f in frames if not f.empty], ignore_index=True)
+    if violations.empty:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return violations[VIOLATION_COLUMNS]
+
+
+def summarize_violations(violations):
+    """
+    Counts violations and affected tickers per rule.
+    """
+    if violations.empty:
+        return pd.DataFrame(columns=['Rule', 'Severity', 'Rows', 'Tickers'])
+    summary = violations.groupby(['Rule', 'Severity']).agg(
+        Rows=('StockCode', 'size'),
+        Tickers=('StockCode', 'nunique'),
+    ).reset_index()
+    return summary.sort_values(['Severity', 'Rows'], ascending=[True, False])
+
+
+def run_validation(input_path, output_path=None, return_threshold=DEFAULT_RETURN_THRESHOLD):
+    """
+    Validates an IDX trading summary CSV and optionally writes the violations table.
+
+    Args:
+        input_path (str): Path to the daily CSV (raw or cleaned).
+        output_path (str): Where to save the violations CSV. Skipped if None.
+        return_threshold (float): Absolute simple return above which a row is an outlier.
+
+    Returns:
+        bool: True if no 'error' severity violations were found.
+    """
+    print(f"[Validation] Loading {input_path}...")
+    try:
+        df = pd.read_csv(input_path)
+    except Exception as e:
+        print(f"[Validation] Error reading {input_path}: {e}")
+        return False
+
+    violations = validate_panel(df, return_threshold=return_threshold)
+    summary = summarize_violations(violations)
+
+    print(f"[Validation] Checked {len(df)} rows, {df['StockCode'].nunique()} tickers.")
+    if summary.empty:
+        print("[Validation] No violations found.")
+    else:
+        print(summary.to_string(index=False))
+
+    if output_path:
+        violations.to_csv(output_path, index=False)
+        print(f"[Validation] Violations saved to {output_path}")
+
+    errors = (violations['Severity'] == 'error').sum() if not violations.empty else 0
+    passed = errors == 0
+    print(f"[Validation] {'PASSED' if passed else 'FAILED'} ({errors} error rows).")
+    return passed
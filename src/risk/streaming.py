@@ -0,0 +1,274 @@
+import math
+from statistics import NormalDist
+
+import pandas as pd
+import numpy as np
+
+# RiskMetrics decay for daily data.
+DEFAULT_LAMBDA = 0.94
+DEFAULT_CONFIDENCE = 0.95
+
+# Monte Carlo shocks are drawn once; each update only rescales their quantile.
+DEFAULT_MC_SIMS = 10000
+DEFAULT_MC_DOF = 5.0
+
+# Returns needed before a ticker's VaR is considered warmed up.
+MIN_OBSERVATIONS = 5
+
+
+class TickerState:
+    """
+    Incremental per-ticker estimators: last price, EWMA mean and variance of log returns.
+    """
+
+    __slots__ = ('price', 'mean', 'var', 'count', 'last_return', 'date')
+
+    def __init__(self, price, date=None):
+        self.price = price
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.last_return = None
+        self.date = date
+
+
+class StreamingRiskMonitor:
+    """
+    Updates returns, EWMA volatility, VaR and exposure in O(1) per price update.
+
+    Parametric VaR uses the normal quantile of the EWMA volatility. Monte Carlo VaR
+    uses a fixed set of pre-drawn Student-t shocks whose quantile is computed once,
+    so each update is a rescale rather than a resimulation. Portfolio VaR is the sum
+    of position VaRs (no diversification), which keeps updates O(1) and errs on the
+    conservative side.
+
+    Args:
+        positions (dict): Ticker -> number of shares held.
+        decay (float): EWMA decay factor (lambda).
+        confidence (float): VaR confidence level.
+        horizon (int): VaR horizon in update steps (sessions).
+        thresholds (dict): Alert limits, any of 'position_var_pct', 'portfolio_var'
+            and 'abs_return'.
+        mc_sims (int): Number of pre-drawn Monte Carlo shocks.
+        mc_dof (float): Degrees of freedom of the Monte Carlo shocks.
+        seed (int): Seed for the Monte Carlo shocks.
+    """
+
+    def __init__(self, positions=None, decay=DEFAULT_LAMBDA, confidence=DEFAULT_CONFIDENCE, horizon=1,
+                 thresholds=None, mc_sims=DEFAULT_MC_SIMS, mc_dof=DEFAULT_MC_DOF, seed=None):
+        self.positions = dict(positions or {})
+        self.decay = decay
+        self.confidence = confidence
+        self.horizon = horizon
+        self.thresholds = thresholds or {}
+        self.states = {}
+
+        self.z = NormalDist().inv_cdf(1 - confidence)
+        rng = np.random.default_rng(seed)
+        shocks = rng.standard_t(mc_dof, mc_sims) * math.sqrt((mc_dof - 2) / mc_dof)
+        self.mc_quantile = float(np.quantile(shocks, 1 - confidence))
+
+        # Running portfolio aggregates, adjusted by deltas on each update
+        self.exposure = 0.0
+        self.portfolio_var_parametric = 0.0
+        self.portfolio_var_mc = 0.0
+        self._position_values = {}
+        self._position_vars = {}
+
+    def warm_start(self, df):
+        """
+        Seeds the estimators from history in one vectorized pass.
+
+        Args:
+            df (pd.DataFrame): Cleaned IDX data with StockCode, Date, Close.
+        """
+        df = df[['StockCode', 'Date', 'Close']].copy()
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values(['StockCode', 'Date'])
+        df['LogReturn'] = np.log(df['Close']).groupby(df['StockCode']).diff()
+
+        alpha = 1 - self.decay
+        grouped = df.groupby('StockCode')['LogReturn']
+        ewm_mean = grouped.transform(lambda r: r.ewm(alpha=alpha, adjust=False, ignore_na=True).mean())
+        ewm_var = grouped.transform(lambda r: (r ** 2).ewm(alpha=alpha, adjust=False, ignore_na=True).mean())
+        df['EwmMean'] = ewm_mean
+        df['EwmVar'] = ewm_var
+        df['Count'] = df['LogReturn'].notna().groupby(df['StockCode']).cumsum()
+
+        for row in df.groupby('StockCode').tail(1).itertuples(index=False):
+            state = TickerState(row.Close, row.Date)
+            state.mean = 0.0 if pd.isna(row.EwmMean) else float(row.EwmMean)
+            state.var = 0.0 if pd.isna(row.EwmVar) else float(row.EwmVar)
+            state.count = int(row.Count)
+            state.last_return = None if pd.isna(row.LogReturn) else float(row.LogReturn)
+            self.states[row.StockCode] = state
+            self._refresh_position(row.StockCode, state)
+
+    def update(self, ticker, price, date=None):
+        """
+        Applies one new close price and returns the ticker's risk snapshot.
+
+        Returns:
+            dict: Ticker metrics, portfolio aggregates and a list of alert messages.
+        """
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = TickerState(price, date)
+        elif price > 0 and state.price > 0:
+            r = math.log(price / state.price)
+            # RiskMetrics EWMA: sigma2_t = lambda * sigma2_t-1 + (1 - lambda) * r_t^2
+            if state.count == 0:
+                state.var = r * r
+                state.mean = r
+            else:
+                state.var = self.decay * state.var + (1 - self.decay) * r * r
+                state.mean = self.decay * state.mean + (1 - self.decay) * r
+            state.count += 1
+            state.last_return = r
+            state.price = price
+            state.date = date
+
+        self._refresh_position(ticker, state)
+        snapshot = self.snapshot(ticker)
+        snapshot['alerts'] = self._check_alerts(ticker, snapshot)
+        return snapshot
+
+    def _ticker_var(self, state, value):
+        """
+        Parametric and Monte Carlo VaR (as positive currency losses) for a position value.
+        """
+        if state.count < MIN_OBSERVATIONS or value == 0:
+            return 0.0, 0.0
+        sigma = math.sqrt(state.var * self.horizon)
+        mu = state.mean * self.horizon
+        parametric = value * (1 - math.exp(mu + self.z * sigma))
+        monte_carlo = value * (1 - math.exp(mu + self.mc_quantile * sigma))
+        return parametric, monte_carlo
+
+    def _refresh_position(self, ticker, state):
+        value = self.positions.get(ticker, 0) * state.price
+        var_p, var_mc = self._ticker_var(state, value)
+        old_value = self._position_values.get(ticker, 0.0)
+        old_p, old_mc = self._position_vars.get(ticker, (0.0, 0.0))
+
+        self.exposure += value - old_value
+        self.portfolio_var_parametric += var_p - old_p
+        self.portfolio_var_mc += var_mc - old_mc
+        self._position_values[ticker] = value
+        self._position_vars[ticker] = (var_p, var_mc)
+
+    def snapshot(self, ticker):
+        state = self.states[ticker]
+        var_p, var_mc = self._position_vars.get(ticker, (0.0, 0.0))
+        return {
+            'ticker': ticker,
+            'date': state.date,
+            'price': state.price,
+            'return': state.last_return,
+            'ewma_vol': math.sqrt(state.var),
+            'exposure': self._position_values.get(ticker, 0.0),
+            'var_parametric': var_p,
+            'var_mc': var_mc,
+            'portfolio_exposure': self.exposure,
+            'portfolio_var_parametric': self.portfolio_var_parametric,
+            'portfolio_var_mc': self.portfolio_var_mc,
+        }
+
+    def _check_alerts(self, ticker, snapshot):
+        alerts = []
+        limit = self.thresholds.get('abs_return')
+        if limit is not None and snapshot['return'] is not None and abs(snapshot['return']) > limit:
+            alerts.append(f"{ticker} moved {snapshot['return']:+.2%} (limit {limit:.2%})")
+
+        limit = self.thresholds.get('position_var_pct')
+        if limit is not None and snapshot['exposure'] > 0:
+            var_pct = max(snapshot['var_parametric'], snapshot['var_mc']) / snapshot['exposure']
+            if var_pct > limit:
+                alerts.append(f"{ticker} VaR {var_pct:.2%} of position (limit {limit:.2%})")
+
+        limit = self.thresholds.get('portfolio_var')
+        if limit is not None:
+            portfolio_var = max(self.portfolio_var_parametric, self.portfolio_var_mc)
+            if portfolio_var > limit:
+                alerts.append(f"Portfolio VaR {portfolio_var:,.0f} (limit {limit:,.0f})")
+        return alerts
+
+
+def replay_feed(df, start=None):
+    """
+    Yields (ticker, close, date) in date order, e.g. from the scraper's daily appends.
+    """
+    df = df[['StockCode', 'Date', 'Close']].copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    if start is not None:
+        df = df[df['Date'] > pd.Timestamp(start)]
+    df = df.sort_values(['Date', 'StockCode'])
+    for row in df.itertuples(index=False):
+        yield row.StockCode, float(row.Close), row.Date
+
+
+def simulated_feed(last_prices, vols, steps, seed=None):
+    """
+    Yields (ticker, close, step) from independent GBM paths, one step at a time.
+
+    Args:
+        last_prices (dict): Ticker -> starting price.
+        vols (dict): Ticker -> per-step volatility of log returns.
+        steps (int): Number of steps to generate.
+        seed (int): Random seed.
+    """
+    rng = np.random.default_rng(seed)
+    tickers = list(last_prices)
+    prices = np.array([last_prices[t] for t in tickers], dtype=float)
+    sigma = np.array([vols[t] for t in tickers], dtype=float)
+    for step in range(1, steps + 1):
+        prices = prices * np.exp(-0.5 * sigma ** 2 + sigma * rng.standard_normal(len(tickers)))
+        for ticker, price in zip(tickers, prices):
+            yield ticker, float(price), step
+
+
+def run(args):
+    """
+    Entry point for `main.py monitor`.
+    """
+    positions = {}
+    for item in args.positions.split(','):
+        ticker, shares = item.split('=')
+        positions[ticker.strip()] = float(shares)
+
+    thresholds = {
+        'abs_return': args.max_return,
+        'position_var_pct': args.max_position_var,
+        'portfolio_var': args.max_portfolio_var,
+    }
+    thresholds = {k: v for k, v in thresholds.items() if v is not None}
+    monitor = StreamingRiskMonitor(positions, confidence=args.confidence, thresholds=thresholds, seed=args.seed)
+
+    df = pd.read_csv(args.data)
+    df = df[df['StockCode'].isin(positions)].copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+
+    if args.simulate:
+        monitor.warm_start(df)
+        feed = simulated_feed(
+            {t: s.price for t, s in monitor.states.items()},
+            {t: math.sqrt(s.var) for t, s in monitor.states.items()},
+            args.simulate, seed=args.seed,
+        )
+    else:
+        start = pd.Timestamp(args.since) if args.since else None
+        if start is not None:
+            monitor.warm_start(df[df['Date'] <= start])
+        feed = replay_feed(df, start)
+
+    print(f"[Risk] Monitoring {', '.join(positions)} at {args.confidence:.0%} confidence...")
+    snapshot = None
+    for ticker, price, stamp in feed:
+        snapshot = monitor.update(ticker, price, stamp)
+        for alert in snapshot['alerts']:
+            print(f"[Risk] ALERT {stamp}: {alert}")
+
+    if snapshot is not None:
+        print(f"[Risk] Exposure: {monitor.exposure:,.0f}")
+        print(f"[Risk] Portfolio VaR (parametric): {monitor.portfolio_var_parametric:,.0f}")
+        print(f"[Risk] Portfolio VaR (Monte Carlo): {monitor.portfolio_var_mc:,.0f}")
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import asyncio
+from collections import defaultdict, deque
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+import numpy as np
+
+from src.analysis import screening
+from src.processing import remarks
+from src.simulation import cache
+from src.simulation import models
+
+DATA_FILES = {
+    'daily': "idx_daily_cleaned.csv",
+    'weekly': "idx_weekly_cleaned.csv",
+    'monthly': "idx_monthly_cleaned.csv",
+}
+
+# How often the data directory is checked for files rewritten by preprocessing.
+DEFAULT_REFRESH_INTERVAL = 10.0
+
+# Latency samples kept per endpoint for the percentile metrics.
+LATENCY_WINDOW = 1000
+
+
+class DataStore:
+    """
+    Keeps the cleaned IDX panels, sector mapping and per-ticker stats resident.
+
+    Each file is reloaded only when its modification time changes, and derived
+    data (screening panels, parameter stats) is rebuilt only for that frequency.
+    """
+
+    def __init__(self, data_dir, mapping_path=None):
+        self.data_dir = data_dir
+        self.mapping_path = mapping_path
+        self.frames = {}
+        self.by_stock = {}
+        self.stats = {}
+        self.panels = None
+        self.flags = None
+        self.mapping = None
+        self._mtimes = {}
+
+    def refresh(self):
+        """
+        Reloads files changed since the last refresh. Returns the reloaded names.
+        """
+        reloaded = []
+        for freq, name in DATA_FILES.items():
+            path = os.path.join(self.data_dir, name)
+            if not os.path.exists(path):
+                continue
+            mtime = os.path.getmtime(path)
+            if self._mtimes.get(freq) == mtime:
+                continue
+
+            df = pd.read_csv(path)
+            df['Date'] = pd.to_datetime(df['Date'])
+            df = df.sort_values(['StockCode', 'Date'])
+            self.frames[freq] = df
+            self.by_stock[freq] = {code: g for code, g in df.groupby('StockCode', sort=False)}
+            self.stats[freq] = self._parameter_stats(df)
+            if freq == 'daily':
+                screening.clear_cache()
+                self.panels = screening.build_panels(screening.prepare_data(df))
+                self.flags = remarks.latest_flags(df) if 'Remarks' in df.columns else None
+            self._mtimes[freq] = mtime
+            reloaded.append(freq)
+
+        if self.mapping_path and os.path.exists(self.mapping_path):
+            mtime = os.path.getmtime(self.mapping_path)
+            if self._mtimes.get('mapping') != mtime:
+                self.mapping = screening.load_sector_mapping(self.mapping_path)
+                self._mtimes['mapping'] = mtime
+                reloaded.append('mapping')
+        return reloaded
+
+    @staticmethod
+    def _parameter_stats(df):
+        """
+        GBM parameter stats per ticker, the same quantities run_monte_carlo reports.
+        """
+        log_returns = np.log1p(df['Return'])
+        grouped = log_returns.groupby(df['StockCode'])
+        stats = pd.DataFrame({
+            'last_price': df.groupby('StockCode')['Close'].last(),
+            'mean_log_return': grouped.mean(),
+            'stdev': grouped.std(),
+        })
+        stats['drift'] = stats['mean_log_return'] - 0.5 * stats['stdev'] ** 2
+        return stats
+
+
+def _require(query, name):
+    if name not in query:
+        raise ValueError(f"Missing query parameter '{name}'")
+    return query[name]
+
+
+class QueryService:
+    """
+    Asyncio HTTP front end serving Monte Carlo, screening and history queries.
+    """
+
+    def __init__(self, store, refresh_interval=DEFAULT_REFRESH_INTERVAL, cache_dir=cache.DEFAULT_CACHE_DIR):
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.cache_dir = cache_dir
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.counts = defaultdict(int)
+        self.routes = {
+            '/health': self.health,
+            '/montecarlo': self.montecarlo,
+            '/screen': self.screen,
+            '/history': self.history,
+            '/metrics': self.metrics,
+        }
+
+    # --- Handlers (run in a worker thread, return JSON serializable dicts) ---
+
+    def health(self, query):
+        return {'status': 'ok', 'frequencies': sorted(self.store.frames)}
+
+    def montecarlo(self, query):
+        stock = _require(query, 'stock')
+        freq = query.get('freq', 'daily')
+        steps = int(query.get('steps', 30))
+        sims = int(query.get('sims', 1000))
+        model = query.get('model', 'gbm')
+        seed = int(query['seed']) if 'seed' in query else None
+
+        stock_df = self.store.by_stock.get(freq, {}).get(stock)
+        if stock_df is None:
+            raise KeyError(f"Stock {stock} not found in {freq} data")
+        last_price = float(stock_df['Close'].iloc[-1])
+
+        if 'horizons' in query:
+            # One path set for all horizons (steps ahead, '1w'/'3m' style accepted)
+            terminal, _ = models.simulate_horizons(
+                np.log1p(stock_df['Return'].to_numpy()), last_price,
+                models.parse_horizons(query['horizons']), sims,
+                model=model, rng=np.random.default_rng(seed),
+            )
+            results = []
+            for horizon, final_prices in terminal.items():
+                expected = float(np.mean(final_prices))
+                results.append({
+                    'steps': horizon,
+                    'expected_price': expected,
+                    'var_5': float(np.percentile(final_prices, 5)),
+                    'implied_growth_pct': (expected - last_price) / last_price * 100,
+                })
+            return {'stock': stock, 'frequency': freq, 'model': model, 'last_price': last_price, 'horizons': results}
+
+        cache_key = None
+        final_prices = None
+        if seed is not None:
+            cache_key = cache.fingerprint(stock_df, {
+                'stock': stock, 'frequency': freq, 'steps': steps,
+                'sims': sims, 'model': model, 'seed': seed,
+            })
+            cached = cache.load(cache_key, self.cache_dir)
+            if cached is not None:
+                final_prices = cached['final_prices']
+
+        if final_prices is None:
+            price_paths, params = models.simulate_price_paths(
+                np.log1p(stock_df['Return'].to_numpy()), last_price, steps, sims,
+                model=model, rng=np.random.default_rng(seed),
+            )
+            final_prices = price_paths[-1]
+            if cache_key is not None:
+                model_details = ', '.join(f"{k}={v:.6g}" for k, v in params.items() if np.isscalar(v))
+                cache.store(cache_key, {
+                    'final_prices': final_prices,
+                    'plot_paths': price_paths[:, :50],
+                    'model_details': np.array(model_details),
+                }, self.cache_dir)
+
+        expected = float(np.mean(final_prices))
+        return {
+            'stock': stock,
+            'frequency': freq,
+            'model': model,
+            'last_price': last_price,
+            'expected_price': expected,
+            'var_5': float(np.percentile(final_prices, 5)),
+            'implied_growth_pct': (expected - last_price) / last_price * 100,
+        }
+
+    def screen(self, query):
+        if self.store.panels is None:
+            raise KeyError("Daily data not loaded")
+        as_of = query.get('as_of')
+        exclude = ()
+        flags = None
+        if query.get('exclude_flagged') in ('1', 'true', 'yes'):
+            if self.store.flags is None:
+                raise ValueError("Daily data has no Remarks column to filter on")
+            exclude = remarks.FLAG_COLUMNS
+            # Resident flags are the latest ones, historical screens decode their own date
+            flags = self.store.flags if as_of is None else remarks.latest_flags(self.store.frames['daily'], as_of)
+        result = screening.screen(
+            None,
+            as_of=as_of,
+            mapping=self.store.mapping,
+            sector=query.get('sector'),
+            shariah_only=query.get('shariah') in ('1', 'true', 'yes'),
+            panels=self.store.panels,
+            flags=flags,
+            exclude=exclude,
+        )
+        top = int(query.get('top', 20))
+        return {'rows': json.loads(result.head(top).to_json(orient='records'))}
+
+    def history(self, query):
+        stock = _require(query, 'stock')
+        freq = query.get('freq', 'daily')
+        stock_df = self.store.by_stock.get(freq, {}).get(stock)
+        if stock_df is None:
+            raise KeyError(f"Stock {stock} not found in {freq} data")
+        if 'start' in query:
+            stock_df = stock_df[stock_df['Date'] >= pd.Timestamp(query['start'])]
+        if 'end' in query:
+            stock_df = stock_df[stock_df['Date'] <= pd.Timestamp(query['end'])]
+        columns = [c for c in ['Date', 'OpenPrice', 'High', 'Low', 'Close', 'Volume', 'Return'] if c in stock_df.columns]
+        stats = self.store.stats[freq].loc[stock]
+        return {
+            'stock': stock,
+            'frequency': freq,
+            'stats': {k: float(v) for k, v in stats.items()},
+            'rows': json.loads(stock_df[columns].to_json(orient='records', date_format='iso')),
+        }
+
+    def metrics(self, query):
+        endpoints = {}
+        for path, samples in self.latencies.items():
+            values = np.array(samples)
+            endpoints[path] = {
+                'count': self.counts[path],
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(np.percentile(values, 50)),
+                'p95_ms': float(np.percentile(values, 95)),
+                'max_ms': float(values.max()),
+            }
+        return {'endpoints': endpoints}
+
+    # --- HTTP plumbing ---
+
+    async def handle(self, reader, writer):
+        start = time.perf_counter()
+        path = None
+        try:
+            request_line = await reader.readline()
+            # Drain headers, the API only uses GET with query strings
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            url = urlsplit(target)
+            path = url.path
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            handler = self.routes.get(path)
+            if method != 'GET' or handler is None:
+                status, body = 404, {'error': f"Unknown endpoint {method} {path}"}
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    status, body = 200, await loop.run_in_executor(None, handler, query)
+                except KeyError as e:
+                    status, body = 404, {'error': str(e).strip("'")}
+                except ValueError as e:
+                    status, body = 400, {'error': str(e)}
+        except Exception as e:
+            status, body = 500, {'error': str(e)}
+
+        payload = json.dumps(body, default=str).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+        if path in self.routes:
+            self.latencies[path].append((time.perf_counter() - start) * 1000)
+            self.counts[path] += 1
+
+    async def watch(self):
+        """
+        Periodically picks up files rewritten by the preprocessing step.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                reloaded = await loop.run_in_executor(None, self.store.refresh)
+                if reloaded:
+                    print(f"[Service] Reloaded: {', '.join(reloaded)}")
+            except Exception as e:
+                print(f"[Service] Refresh failed: {e}")
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"[Service] Listening on http://{host}:{port}")
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def run(args):
+    """
+    Entry point for `main.py serve`.
+    """
+    store = DataStore(args.data_dir, args.mapping)
+    print(f"[Service] Loading data from {args.data_dir}...")
+    loaded = store.refresh()
+    print(f"[Service] Loaded: {', '.join(loaded) if loaded else 'nothing yet'}")
+
+    # Share the result cache with scripts/monte_carlo.py (results/ next to data/)
+    cache_dir = os.path.join(args.data_dir, '..', '..', 'results', 'cache')
+    service = QueryService(store, refresh_interval=args.refresh_interval, cache_dir=cache_dir)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("[Service] Stopped.")
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import pandas as pd
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join('results', 'cache')
+
+# Total on-disk budget for cached simulation outputs.
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def fingerprint(stock_df, params):
+    """
+    Content hash of a simulation request.
+
+    Combines a hash of the ticker's input slice (Date, Close, Return) with the
+    simulation parameters, so any change in the data or the scenario gives a new key.
+
+    Args:
+        stock_df (pd.DataFrame): The ticker's rows used to fit the model.
+        params (dict): JSON serializable simulation parameters, including the seed.
+
+    Returns:
+        str: Hex digest used as the cache key.
+    """
+    columns = [c for c in ['Date', 'Close', 'Return'] if c in stock_df.columns]
+    row_hashes = pd.util.hash_pandas_object(stock_df[columns], index=False).to_numpy()
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}.npz")
+
+
+def load(key, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the cached arrays for `key` as a dict, or None on a miss.
+
+    A hit refreshes the entry's modification time, which drives LRU eviction.
+    """
+    path = _entry_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            entry = {name: data[name] for name in data.files}
+    except Exception as e:
+        print(f"[Cache] Dropping unreadable entry {key[:12]}: {e}")
+        os.remove(path)
+        return None
+    os.utime(path)
+    return entry
+
+
+def store(key, arrays, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Saves named arrays under `key` and evicts least recently used entries over budget.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_dir, key)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Removes the least recently used entries until the cache fits in `max_bytes`.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.npz'):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(cache_dir, name))
+        total -= size
@@ -0,0 +1,224 @@
+import numpy as np
+
+# Each model is a (fit, simulate) pair:
+#   fit(log_returns) -> params dict
+#   simulate(params, steps, simulations, rng) -> (steps, simulations) array of log returns
+# All simulations are batched over paths; only GARCH needs a loop over time steps,
+# which is inherent to the variance recursion.
+
+DEFAULT_BLOCK_SIZE = 5
+
+# Bounds for the Student-t degrees of freedom fitted from excess kurtosis.
+MIN_T_DOF = 2.5
+MAX_T_DOF = 100.0
+
+# (alpha, beta) grid searched by the GARCH(1,1) quasi-likelihood fit.
+GARCH_ALPHA_GRID = np.linspace(0.01, 0.30, 30)
+GARCH_BETA_GRID = np.linspace(0.50, 0.98, 49)
+
+
+def _moments(log_returns):
+    log_returns = np.asarray(log_returns, dtype=float)
+    log_returns = log_returns[np.isfinite(log_returns)]
+    mu = float(log_returns.mean())
+    var = float(log_returns.var(ddof=1))
+    return log_returns, mu, var
+
+
+def fit_gbm(log_returns):
+    _, mu, var = _moments(log_returns)
+    return {'drift': mu - 0.5 * var, 'stdev': np.sqrt(var)}
+
+
+def simulate_gbm(params, steps, simulations, rng):
+    return params['drift'] + params['stdev'] * rng.standard_normal((steps, simulations))
+
+
+def fit_student_t(log_returns):
+    """
+    Fits the degrees of freedom by matching excess kurtosis (6 / (nu - 4)).
+    """
+    log_returns, mu, var = _moments(log_returns)
+    centered = log_returns - mu
+    excess_kurtosis = np.mean(centered ** 4) / np.mean(centered ** 2) ** 2 - 3
+    if excess_kurtosis > 0:
+        dof = np.clip(6.0 / excess_kurtosis + 4.0, MIN_T_DOF, MAX_T_DOF)
+    else:
+        dof = MAX_T_DOF
+    return {'drift': mu - 0.5 * var, 'stdev': np.sqrt(var), 'dof': float(dof)}
+
+
+def simulate_student_t(params, steps, simulations, rng):
+    dof = params['dof']
+    # Rescale to unit variance so stdev keeps its meaning
+    shocks = rng.standard_t(dof, (steps, simulations)) * np.sqrt((dof - 2) / dof)
+    return params['drift'] + params['stdev'] * shocks
+
+
+def fit_bootstrap(log_returns, block_size=DEFAULT_BLOCK_SIZE):
+    log_returns, _, _ = _moments(log_returns)
+    return {'history': log_returns, 'block_size': int(min(block_size, len(log_returns)))}
+
+
+def simulate_bootstrap(params, steps, simulations, rng):
+    """
+    Moving block bootstrap: each path is a concatenation of random blocks of the
+    ticker's own history, drawn for all paths at once.
+    """
+    history = params['history']
+    block = params['block_size']
+    n_blocks = -(-steps // block)
+    starts = rng.integers(0, len(history) - block + 1, size=(n_blocks, 1, simulations))
+    idx = starts + np.arange(block)[None, :, None]
+    return history[idx.reshape(n_blocks * block, simulations)[:steps]]
+
+
+def _garch_variance(residuals, omega, alpha, beta, initial_var):
+    """
+    Runs the GARCH(1,1) variance recursion for many parameter sets at once.
+    """
+    sigma2 = np.empty((len(residuals),) + np.shape(alpha))
+    sigma2[0] = initial_var
+    for t in range(1, len(residuals)):
+        sigma2[t] = omega + alpha * residuals[t - 1] ** 2 + beta * sigma2[t - 1]
+    return sigma2
+
+
+def fit_garch(log_returns):
+    """
+    Fits GARCH(1,1) with variance targeting and a grid search over (alpha, beta)
+    maximizing the Gaussian quasi-likelihood.
+    """
+    log_returns, mu, var = _moments(log_returns)
+    residuals = log_returns - mu
+
+    alpha, beta = np.meshgrid(GARCH_ALPHA_GRID, GARCH_BETA_GRID)
+    stationary = alpha + beta < 0.999
+    alpha, beta = alpha[stationary], beta[stationary]
+    omega = var * (1 - alpha - beta)
+
+    sigma2 = _garch_variance(residuals, omega, alpha, beta, var)
+    log_lik = -0.5 * np.sum(np.log(sigma2) + residuals[:, None] ** 2 / sigma2, axis=0)
+    best = np.argmax(log_lik)
+
+    last_var = omega[best] + alpha[best] * residuals[-1] ** 2 + beta[best] * sigma2[-1, best]
+    return {
+        'mu': mu,
+        'omega': float(omega[best]),
+        'alpha': float(alpha[best]),
+        'beta': float(beta[best]),
+        'last_var': float(last_var),
+        'stdev': np.sqrt(var),
+        'drift': mu - 0.5 * var,
+    }
+
+
+def simulate_garch(params, steps, simulations, rng):
+    shocks = rng.standard_normal((steps, simulations))
+    log_returns = np.empty_like(shocks)
+    sigma2 = np.full(simulations, params['last_var'])
+    for t in range(steps):
+        eps = np.sqrt(sigma2) * shocks[t]
+        log_returns[t] = params['mu'] - 0.5 * sigma2 + eps
+        sigma2 = params['omega'] + params['alpha'] * eps ** 2 + params['beta'] * sigma2
+    return log_returns
+
+
+MODELS = {
+    'gbm': (fit_gbm, simulate_gbm),
+    'student_t': (fit_student_t, simulate_student_t),
+    'bootstrap': (fit_bootstrap, simulate_bootstrap),
+    'garch': (fit_garch, simulate_garch),
+}
+
+
+def simulate_price_paths(log_returns, last_price, steps, simulations, model='gbm', rng=None):
+    """
+    Fits the chosen model to historical log returns and simulates price paths.
+
+    Args:
+        log_returns (array-like): Historical log returns of the ticker.
+        last_price (float): Starting price, stored as the first row of the paths.
+        steps (int): Number of time steps, including the starting row.
+        simulations (int): Number of simulated paths.
+        model (str): One of MODELS.
+        rng (np.random.Generator): Random generator, a fresh one if None.
+
+    Returns:
+        tuple: (price_paths of shape (steps, simulations), fitted params dict)
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}'. Available: {', '.join(MODELS)}")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    fit, simulate = MODELS[model]
+    params = fit(log_returns)
+
+    price_paths = np.empty((steps, simulations))
+    price_paths[0] = last_price
+    if steps > 1:
+        increments = simulate(params, steps - 1, simulations, rng)
+        price_paths[1:] = last_price * np.exp(np.cumsum(increments, axis=0))
+    return price_paths, params
+
+
+# Daily steps per period, used to express weekly/monthly horizons on a daily path set.
+FREQUENCY_STEPS = {'d': 1, 'w': 5, 'm': 21}
+
+
+def parse_horizons(text):
+    """
+    Parses a horizon list such as '5,21,63,252' or '1w,1m,3m,12m' into daily steps.
+    """
+    horizons = set()
+    for token in text.split(','):
+        token = token.strip().lower()
+        if not token:
+            continue
+        unit = token[-1] if token[-1] in FREQUENCY_STEPS else 'd'
+        count = int(token[:-1] if token[-1] in FREQUENCY_STEPS else token)
+        if count <= 0:
+            raise ValueError(f"Horizon must be positive: '{token}'")
+        horizons.add(count * FREQUENCY_STEPS[unit])
+    return sorted(horizons)
+
+
+def simulate_horizons(log_returns, last_price, horizons, simulations, model='gbm', rng=None):
+    """
+    Simulates one path set up to the longest horizon and captures every horizon on it.
+
+    The model is fitted once on daily returns, so weekly and monthly horizons come
+    from the same daily paths instead of separate fits on resampled data. Price paths
+    are never materialized: a running sum of log returns is advanced between
+    consecutive horizons and the terminal prices are recorded at each one.
+
+    Args:
+        log_returns (array-like): Historical (daily) log returns of the ticker.
+        last_price (float): Starting price.
+        horizons (list): Horizons in steps ahead (see parse_horizons).
+        simulations (int): Number of simulated paths.
+        model (str): One of MODELS.
+        rng (np.random.Generator): Random generator, a fresh one if None.
+
+    Returns:
+        tuple: (dict horizon -> terminal prices array, fitted params dict)
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}'. Available: {', '.join(MODELS)}")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    horizons = sorted(set(int(h) for h in horizons))
+    fit, simulate = MODELS[model]
+    params = fit(log_returns)
+    increments = simulate(params, horizons[-1], simulations, rng)
+
+    terminal = {}
+    running = np.zeros(simulations)
+    previous = 0
+    for horizon in horizons:
+        running += increments[previous:horizon].sum(axis=0)
+        terminal[horizon] = last_price * np.exp(running)
+        previous = horizon
+    return terminal, params